@@ -1,4 +1,4 @@
-import io, threading, time
+import io, subprocess, threading, time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -12,17 +12,34 @@ try:
 except Exception:
     FfmpegOutput = None
 
-from .config import CAM_SIZE, JPEG_Q, FPS, SNAP_DIR
+try:
+    import numpy as np
+    import simplejpeg
+except Exception:
+    np = simplejpeg = None
+
+from .config import (
+    CAM_SIZE, JPEG_Q, FPS, SNAP_DIR,
+    SETTLE_FRAMES, SETTLE_DIFF, SETTLE_TIMEOUT_SEC
+)
+
+def _stamp(tag: str = "") -> str:
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if not tag:
+        return ts
+    return ts + "_" + "".join(c if c.isalnum() or c in "-_" else "_" for c in tag)
 
 class StreamingBuffer(io.BufferedIOBase):
     def __init__(self):
         super().__init__()
         self.frame: Optional[bytes] = None
+        self.ts = 0.0  # monotonic time the current frame arrived
         self.cv = threading.Condition()
 
     def write(self, b: bytes):
         with self.cv:
             self.frame = b
+            self.ts = time.monotonic()
             self.cv.notify_all()
 
 class CameraManager:
@@ -30,6 +47,7 @@ class CameraManager:
     Owns the sensor. Provides:
       - start_mjpeg_stream() / stop_mjpeg_stream()
       - snapshot() from last MJPEG frame
+      - wait_stable() until consecutive MJPEG frames stop changing
       - record_mp4(seconds) with exclusive access (pauses MJPEG, records, resumes)
     """
     def __init__(self):
@@ -68,23 +86,70 @@ class CameraManager:
                    b'\r\nContent-Type: image/jpeg\r\nContent-Length: ' +
                    str(len(frame)).encode() + b'\r\n\r\n' + frame + b'\r\n')
 
+    def wait_stable(self, frames: int = SETTLE_FRAMES, diff: float = SETTLE_DIFF,
+                    timeout: float = SETTLE_TIMEOUT_SEC) -> bool:
+        """
+        Block until `frames` consecutive frame pairs differ by at most `diff`
+        (mean absolute grayscale difference on a downscaled decode).
+        Returns False on timeout or when frames can't be checked.
+        """
+        if frames <= 0 or simplejpeg is None or not self._streaming:
+            return False
+        deadline = time.monotonic() + timeout
+        prev, calm = None, 0
+        while True:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                return False
+            with self.stream_buf.cv:
+                if not self.stream_buf.cv.wait(timeout=left):
+                    return False
+                frame = self.stream_buf.frame
+            if not frame:
+                continue
+            try:
+                # DCT-domain downscale keeps this cheap on a Pi
+                cur = simplejpeg.decode_jpeg(frame, colorspace="GRAY",
+                                             min_width=120, min_height=68).astype(np.int16)
+            except Exception:
+                continue
+            if prev is not None and prev.shape == cur.shape:
+                if float(np.abs(cur - prev).mean()) <= diff:
+                    calm += 1
+                    if calm >= frames:
+                        return True
+                else:
+                    calm = 0
+            prev = cur
+
     # --- Snapshots / Recording ---
-    def snapshot(self, out_dir: Path = SNAP_DIR) -> Path:
-        name = datetime.now().strftime("%Y%m%d_%H%M%S") + ".jpg"
+    def snapshot(self, out_dir: Path = SNAP_DIR, tag: str = "",
+                 after: Optional[float] = None, timeout: float = SETTLE_TIMEOUT_SEC) -> Path:
+        """
+        Save the latest MJPEG frame. With `after` (a time.monotonic() value),
+        wait for a frame that arrived a full frame interval later, so it was
+        exposed after that point rather than buffered from before it.
+        """
+        name = _stamp(tag) + ".jpg"
         path = out_dir / name
-        with self.stream_buf.cv:
-            frame = self.stream_buf.frame
+        buf = self.stream_buf
+        with buf.cv:
+            if after is not None:
+                fresh = lambda: buf.frame and buf.ts >= after + 1.0 / FPS
+                if not buf.cv.wait_for(fresh, timeout=timeout):
+                    raise RuntimeError("No MJPEG frame after settling")
+            frame = buf.frame
         if not frame:
             raise RuntimeError("No MJPEG frame available")
         path.write_bytes(frame)
         return path
 
-    def record_mp4(self, seconds: int, out_dir: Path = SNAP_DIR) -> Path:
+    def record_mp4(self, seconds: int, out_dir: Path = SNAP_DIR, tag: str = "") -> Path:
         """
         Pause MJPEG, record H.264→MP4 for `seconds`, resume MJPEG.
         Prefers Picamera2+FFmpeg; falls back to rpicam-vid if needed.
         """
-        name = datetime.now().strftime("%Y%m%d_%H%M%S") + ".mp4"
+        name = _stamp(tag) + ".mp4"
         path = out_dir / name
 
         with self._lock:
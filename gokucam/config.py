@@ -24,6 +24,18 @@ TILT_MIN, TILT_MAX = map(int, os.getenv("GOKU_TILT_RANGE", "-60,60").split(","))
 STEP_DEG = int(os.getenv("GOKU_STEP", "8"))
 SERVO_KEEPALIVE_SEC = int(os.getenv("GOKU_KEEPALIVE", "2"))  # 0 = disable
 
+# Servo settling: estimated from the commanded move, optionally confirmed on frames
+SERVO_SPEED_DPS   = float(os.getenv("GOKU_SERVO_SPEED", "300"))      # deg/s, conservative for SG90-class
+SETTLE_MARGIN_SEC = float(os.getenv("GOKU_SETTLE_MARGIN", "0.08"))   # damping after trajectory ends
+SETTLE_FRAMES     = int(os.getenv("GOKU_SETTLE_FRAMES", "2"))        # calm frame pairs, 0 = disable
+SETTLE_DIFF       = float(os.getenv("GOKU_SETTLE_DIFF", "3.0"))      # mean abs gray diff (0-255)
+SETTLE_TIMEOUT_SEC = float(os.getenv("GOKU_SETTLE_TIMEOUT", "1.5"))
+
+# Presets & patrol
+PRESETS_FILE = Path(os.getenv("GOKU_PRESETS_FILE", str(BASE_DIR / "presets.json")))
+PATROL_INTERVAL_SEC = int(os.getenv("GOKU_PATROL_INTERVAL", "300"))  # between cycle starts
+PATROL_HOURS = os.getenv("GOKU_PATROL_HOURS", "")                    # e.g. "07:00-19:30", empty = always
+
 # Server
 HOST = os.getenv("GOKU_HOST", "0.0.0.0")
 PORT = int(os.getenv("GOKU_PORT", "8000"))
@@ -0,0 +1,255 @@
+import json, math, os, re, threading, time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+from .config import (
+    PRESETS_FILE, PATROL_INTERVAL_SEC, PATROL_HOURS,
+    PAN_MIN, PAN_MAX, TILT_MIN, TILT_MAX
+)
+from .camera_manager import camera
+from .servo_controller import servos, clamp
+
+CLIP_MAX_SEC = 60        # clips block stop() until they finish, so keep them short
+STOP_JOIN_SEC = 2.0      # how long stop() waits before reporting "stopping"
+
+_HOURS_RE = re.compile(r"^\s*(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*$")
+
+def _parse_hours(spec: str):
+    """'07:00-19:30' -> ((7, 0), (19, 30)); empty -> None (always active)."""
+    if spec is None or spec == "":
+        return None
+    if not isinstance(spec, str):
+        raise ValueError("hours must be a string like '07:00-19:30'")
+    m = _HOURS_RE.match(spec)
+    if not m:
+        raise ValueError(f"Bad hours: {spec!r}, expected 'HH:MM-HH:MM'")
+    h1, m1, h2, m2 = map(int, m.groups())
+    if h1 > 23 or h2 > 23 or m1 > 59 or m2 > 59:
+        raise ValueError(f"Bad hours: {spec!r}, time out of range")
+    return (h1, m1), (h2, m2)
+
+def _in_window(window, now: datetime) -> bool:
+    if window is None:
+        return True
+    start, end = window
+    cur = (now.hour, now.minute)
+    if start <= end:
+        return start <= cur < end
+    return cur >= start or cur < end  # window wraps midnight
+
+def _until_open(window, now: datetime) -> float:
+    """Seconds from `now` until the window next opens."""
+    (h, m), _ = window
+    opens = now.replace(hour=h, minute=m, second=0, microsecond=0)
+    if opens <= now:
+        opens += timedelta(days=1)
+    return (opens - now).total_seconds()
+
+class PresetStore:
+    """
+    Named pan/tilt positions persisted as JSON:
+      {"burrow": {"pan": -40, "tilt": 10}, ...}
+    """
+    def __init__(self, path: Path = PRESETS_FILE):
+        self.path = path
+        self._lock = threading.RLock()
+        self._presets = {}
+        if path.exists():
+            try:
+                self._presets = self._validate(json.loads(path.read_text()))
+            except Exception as e:
+                print("[GokuCam][Presets] Failed to load", path, e)
+
+    @staticmethod
+    def _validate(data):
+        """Keep only name -> {"pan": number, "tilt": number} entries."""
+        if not isinstance(data, dict):
+            raise ValueError("expected an object of presets")
+        good = {}
+        for name, p in data.items():
+            ok = isinstance(p, dict) and all(
+                isinstance(p.get(k), (int, float)) and not isinstance(p.get(k), bool)
+                and math.isfinite(p[k]) for k in ("pan", "tilt")
+            )
+            if not ok:
+                print("[GokuCam][Presets] Skipping bad preset", repr(name), p)
+                continue
+            good[name] = {"pan": clamp(p["pan"], PAN_MIN, PAN_MAX),
+                          "tilt": clamp(p["tilt"], TILT_MIN, TILT_MAX)}
+        return good
+
+    def _save(self):
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self._presets, indent=2))
+        os.replace(tmp, self.path)
+
+    def all(self):
+        with self._lock:
+            return {k: dict(v) for k, v in self._presets.items()}
+
+    def get(self, name: str):
+        with self._lock:
+            p = self._presets.get(name)
+            return dict(p) if p else None
+
+    def set(self, name: str, pan: float, tilt: float):
+        if not (math.isfinite(pan) and math.isfinite(tilt)):
+            raise ValueError("pan and tilt must be finite numbers")
+        # store where the servo will actually go
+        pan  = clamp(pan, PAN_MIN, PAN_MAX)
+        tilt = clamp(tilt, TILT_MIN, TILT_MAX)
+        with self._lock:
+            self._presets[name] = {"pan": pan, "tilt": tilt}
+            self._save()
+            return dict(self._presets[name])
+
+    def delete(self, name: str) -> bool:
+        with self._lock:
+            if name not in self._presets:
+                return False
+            del self._presets[name]
+            self._save()
+            return True
+
+class PatrolScheduler:
+    """
+    Cycles through presets every `interval` seconds (optionally only inside
+    an "HH:MM-HH:MM" window). At each stop it waits for the servos to settle,
+    then takes a snapshot or a short clip.
+
+    A stop is {"preset": name, "action": "snapshot"|"clip", "secs": int}.
+    """
+    def __init__(self, presets: PresetStore):
+        self.presets = presets
+        self._lock = threading.RLock()
+        self._life = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._plan = {}
+        self._status = {"running": False, "cycles": 0, "last": [], "error": None}
+
+    def start(self, stops=None, interval: int = PATROL_INTERVAL_SEC, hours: str = PATROL_HOURS):
+        # validate everything before touching a patrol that may be running
+        if stops is None:
+            stops = [{"preset": n} for n in self.presets.all()]
+        if not isinstance(stops, list) or not all(isinstance(s, dict) for s in stops):
+            raise ValueError("stops must be a list of objects")
+        stops = [{"preset": s.get("preset"),
+                  "action": s.get("action", "snapshot"),
+                  "secs": s.get("secs", 5)} for s in stops]
+        for s in stops:
+            if not isinstance(s["preset"], str) or self.presets.get(s["preset"]) is None:
+                raise ValueError(f"Unknown preset: {s['preset']}")
+            if s["action"] not in ("snapshot", "clip"):
+                raise ValueError(f"Unknown action: {s['action']}")
+            try:
+                s["secs"] = int(s["secs"])
+            except (TypeError, ValueError):
+                raise ValueError(f"Bad secs: {s['secs']!r}")
+            if not 1 <= s["secs"] <= CLIP_MAX_SEC:
+                raise ValueError(f"secs must be between 1 and {CLIP_MAX_SEC}")
+        if not stops:
+            raise ValueError("No presets to patrol")
+        try:
+            interval = int(interval)
+        except (TypeError, ValueError):
+            raise ValueError(f"Bad interval: {interval!r}")
+        if interval < 1:
+            raise ValueError("interval must be at least 1 second")
+        window = _parse_hours(hours)
+
+        # _life serialises start/stop; _lock stays free for the worker's status updates
+        with self._life:
+            # a worker still finishing a clip is handed to the new one to wait on,
+            # so the servos don't move away mid-recording
+            prev = self._halt()
+            with self._lock:
+                self._plan = {"stops": stops, "interval": interval, "hours": hours}
+                self._stop = threading.Event()
+                self._status.update(running=True, cycles=0, last=[], error=None)
+                self._thread = threading.Thread(
+                    target=self._run, args=(stops, interval, window, self._stop, prev), daemon=True
+                )
+                self._thread.start()
+        return self.status()
+
+    def stop(self):
+        """
+        Signal the worker and wait up to STOP_JOIN_SEC for it. A clip in
+        progress can't be interrupted; status() reports "stopping" until it ends.
+        """
+        with self._life:
+            self._halt()
+        return self.status()
+
+    def _halt(self):
+        with self._lock:
+            self._stop.set()
+            t = self._thread
+        if t is not None and t is not threading.current_thread():
+            t.join(STOP_JOIN_SEC)
+        with self._lock:
+            self._thread = None
+            self._status["running"] = False
+            if t is not None and t.is_alive():
+                self._stopping = t
+            prev = self._stopping
+        return prev if prev is not None and prev.is_alive() else None
+
+    def status(self):
+        with self._lock:
+            stopping = self._stopping is not None and self._stopping.is_alive()
+            return {**self._status, **self._plan, "stopping": stopping,
+                    "last": list(self._status["last"])}
+
+    def _run(self, stops, interval, window, stop, prev=None):
+        while prev is not None and prev.is_alive() and not stop.is_set():
+            prev.join(0.5)
+        while not stop.is_set():
+            started = time.monotonic()
+            now = datetime.now()
+            if not _in_window(window, now):
+                stop.wait(max(1.0, _until_open(window, now)))
+                continue
+            results, complete = self._cycle(stops, stop)
+            errors = [f"{r['preset']}: {r['error']}" for r in results if "error" in r]
+            with self._lock:
+                if self._stop is stop:  # a newer patrol owns the status now
+                    if complete:
+                        self._status["cycles"] += 1
+                    self._status["last"] = results
+                    self._status["error"] = "; ".join(errors) or None
+            stop.wait(max(0.0, interval - (time.monotonic() - started)))
+
+    def _cycle(self, stops, stop):
+        """Visit every stop; returns (results, ran_to_the_end)."""
+        results = []
+        for s in stops:
+            if stop.is_set():
+                return results, False
+            p = self.presets.get(s["preset"])
+            if p is None:  # deleted while patrolling
+                results.append({"preset": s["preset"], "error": "preset not found"})
+                continue
+            try:
+                servos.move_to(p["pan"], p["tilt"])
+                if not servos.wait_settled(stop):
+                    return results, False
+                settled_at = time.monotonic()
+                # trajectory says we're there; confirm the picture has stopped moving
+                stable = camera.wait_stable()
+                if s["action"] == "clip":
+                    path = camera.record_mp4(s["secs"], tag=s["preset"])
+                else:
+                    path = camera.snapshot(tag=s["preset"], after=settled_at)
+                results.append({"preset": s["preset"], "saved": str(path), "stable": stable})
+            except Exception as e:
+                print(f"[GokuCam][Patrol] stop {s['preset']!r} failed:", e)
+                results.append({"preset": s["preset"], "error": str(e)})
+        return results, True
+
+# singletons used by web app
+presets = PresetStore()
+patrol = PatrolScheduler(presets)
@@ -1,7 +1,8 @@
 import threading, time
 from .config import (
     PAN_MIN, PAN_MAX, TILT_MIN, TILT_MAX,
-    PAN_PORT, TILT_PORT, SERVO_KEEPALIVE_SEC
+    PAN_PORT, TILT_PORT, SERVO_KEEPALIVE_SEC,
+    SERVO_SPEED_DPS, SETTLE_MARGIN_SEC
 )
 
 try:
@@ -23,6 +24,7 @@ class ServoController:
             print("[GokuCam][Servos][WARNING] PAN and TILT are using the SAME port! Set GOKU_PAN_PORT and GOKU_TILT_PORT differently.")
         self._state = {"pan": 0, "tilt": 0}
         self._lock = threading.RLock()
+        self._settle_at = 0.0  # monotonic time the last commanded move should be done
         # center on start
         self._apply(0, 0)
         # keepalive thread
@@ -31,10 +33,25 @@ class ServoController:
             t.start()
 
     def _apply(self, pan_angle, tilt_angle):
-        self.pan.angle(clamp(pan_angle, PAN_MIN, PAN_MAX))
-        self.tilt.angle(clamp(tilt_angle, TILT_MIN, TILT_MAX))
-        self._state["pan"]  = clamp(pan_angle, PAN_MIN, PAN_MAX)
-        self._state["tilt"] = clamp(tilt_angle, TILT_MIN, TILT_MAX)
+        pan_angle  = clamp(pan_angle, PAN_MIN, PAN_MAX)
+        tilt_angle = clamp(tilt_angle, TILT_MIN, TILT_MAX)
+        self.pan.angle(pan_angle)
+        self.tilt.angle(tilt_angle)
+        self._track(pan_angle, tilt_angle)
+        self._state["pan"]  = pan_angle
+        self._state["tilt"] = tilt_angle
+
+    def _track(self, pan_angle, tilt_angle):
+        # Both axes travel at once, so the longer one bounds the move. If the
+        # previous move is still in flight, the horn may be up to its remaining
+        # travel away from the old target, so add that on top.
+        now = time.monotonic()
+        in_flight = max(0.0, self._settle_at - SETTLE_MARGIN_SEC - now)
+        travel = max(abs(pan_angle - self._state["pan"]),
+                     abs(tilt_angle - self._state["tilt"]))
+        if travel == 0 and in_flight == 0:
+            return
+        self._settle_at = now + in_flight + travel / SERVO_SPEED_DPS + SETTLE_MARGIN_SEC
 
     def set_pan(self, a):
         with self._lock:
@@ -54,6 +71,24 @@ class ServoController:
         with self._lock:
             return self.set_tilt(self._state["tilt"] + clamp(delta, -15, 15))
 
+    def move_to(self, pan_angle, tilt_angle):
+        with self._lock:
+            self._apply(pan_angle, tilt_angle)
+            return dict(self._state)
+
+    def settle_remaining(self):
+        with self._lock:
+            return max(0.0, self._settle_at - time.monotonic())
+
+    def wait_settled(self, stop=None):
+        """Sleep until the last commanded move should have finished.
+        Returns False if `stop` (a threading.Event) was set first."""
+        left = self.settle_remaining()
+        if stop is not None:
+            return not stop.wait(left)
+        time.sleep(left)
+        return True
+
     def center(self):
         with self._lock:
             self._apply(0, 0)
@@ -64,9 +99,9 @@ class ServoController:
             seq_pan  = [0, -45, -90, -45, 0, 45, 90, 45, 0]
             seq_tilt = [0, -20, -40, -20, 0, 20, 40, 20, 0]
         for a in seq_pan:
-            self.set_pan(a); time.sleep(0.25)
+            self.set_pan(a); self.wait_settled()
         for a in seq_tilt:
-            self.set_tilt(a); time.sleep(0.25)
+            self.set_tilt(a); self.wait_settled()
         return dict(self._state)
 
     def state(self):
@@ -4,6 +4,7 @@ from flask import Flask, Response, request, jsonify, render_template, send_from_
 from .config import STEP_DEG, SNAP_DIR
 from .camera_manager import camera
 from .servo_controller import servos
+from .patrol import presets, patrol
 
 app = Flask(__name__, template_folder="templates", static_folder="static")
 
@@ -61,6 +62,55 @@ def api_center():
 def api_sweep():
     return jsonify(servos.sweep_demo())
 
+# --- Presets / Patrol APIs ---
+@app.route("/api/presets", methods=["GET"])
+def api_presets():
+    return jsonify(presets.all())
+
+@app.route("/api/presets/<name>", methods=["POST"])
+def api_preset_save(name):
+    # save the current position unless pan/tilt are given
+    state = servos.state()
+    try:
+        pan  = float(request.args.get("pan",  state["pan"]))
+        tilt = float(request.args.get("tilt", state["tilt"]))
+        return jsonify({name: presets.set(name, pan, tilt)})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+@app.route("/api/presets/<name>", methods=["DELETE"])
+def api_preset_delete(name):
+    if presets.delete(name):
+        return jsonify({"deleted": name})
+    return jsonify({"error": "not found"}), 404
+
+@app.route("/api/presets/<name>/goto", methods=["POST"])
+def api_preset_goto(name):
+    p = presets.get(name)
+    if p is None:
+        return jsonify({"error": "not found"}), 404
+    return jsonify(servos.move_to(p["pan"], p["tilt"]))
+
+@app.route("/api/patrol", methods=["GET"])
+def api_patrol():
+    return jsonify(patrol.status())
+
+@app.route("/api/patrol/start", methods=["POST"])
+def api_patrol_start():
+    # body (all optional): {"stops": [{"preset", "action", "secs"}], "interval": s, "hours": "HH:MM-HH:MM"}
+    body = request.get_json(silent=True) or {}
+    if not isinstance(body, dict):
+        return jsonify({"error": "body must be a JSON object"}), 400
+    kw = {k: body[k] for k in ("stops", "interval", "hours") if k in body}
+    try:
+        return jsonify(patrol.start(**kw))
+    except (KeyError, ValueError, TypeError) as e:
+        return jsonify({"error": str(e)}), 400
+
+@app.route("/api/patrol/stop", methods=["POST"])
+def api_patrol_stop():
+    return jsonify(patrol.stop())
+
 # --- Media APIs ---
 @app.route("/api/snapshot", methods=["POST"])
 def api_snapshot():
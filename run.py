@@ -1,10 +1,12 @@
 import atexit
 from gokucam.camera_manager import camera
 from gokucam.web import create_app
+from gokucam.patrol import patrol
 from gokucam.config import HOST, PORT
 
 app = create_app()
 atexit.register(lambda: camera.stop_mjpeg_stream())
+atexit.register(lambda: patrol.stop())
 
 if __name__ == "__main__":
     app.run(host=HOST, port=PORT, threaded=True)